@@ -1,15 +1,17 @@
+# Heavy modules (plotly, pandas, soundfile, scipy, numba, torch) are imported
+# lazily inside the functions that use them so cold start only pays for
+# streamlit + numpy; Python caches modules, so subsequent calls are free
 import streamlit as st
 import numpy as np
-import librosa
-import soundfile as sf
-from huggingface_hub import InferenceClient
-import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime
-import json
+import io
+import orjson
 import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-import pandas as pd
 import warnings
 
 warnings.filterwarnings('ignore')
@@ -93,6 +95,23 @@ EMOTION_CONFIG = {
     'Surprise': {'color': '#ec4899', 'emoji': '😲', 'rgb': (236, 72, 153)},
 }
 
+EMOTIONS = tuple(EMOTION_CONFIG)
+
+# Model label -> canonical emotion name, precomputed so inference does a single dict lookup per label
+LABEL_TO_EMOTION = {
+    'anger': 'Anger',
+    'angry': 'Anger',
+    'disgust': 'Disgust',
+    'fear': 'Fear',
+    'happy': 'Happiness',
+    'happiness': 'Happiness',
+    'joy': 'Happiness',
+    'neutral': 'Neutral',
+    'sad': 'Sadness',
+    'sadness': 'Sadness',
+    'surprise': 'Surprise',
+}
+
 LANGUAGES = {
     'English': 'en',
     'Spanish': 'es',
@@ -135,89 +154,186 @@ PROMPTS = {
     ]
 }
 
-def get_emotion_from_huggingface(audio_path: str) -> dict:
-    """Get emotion prediction from Hugging Face Inference API"""
-    if not st.session_state.hf_token:
-        st.error("❌ Hugging Face API key not configured. Please set HUGGING_FACE_API_KEY environment variable.")
-        return None
-    
+HF_MODEL = "jihedjabnoun/wavlm-base-emotion"
+
+# Inference requests from concurrent sessions are collected for up to
+# _BATCH_WAIT seconds (or _BATCH_MAX items) and dispatched together. The HF
+# endpoint only accepts one clip per call, so "together" means issuing the
+# calls concurrently on a thread pool; each caller blocks on its own future.
+_BATCH_MAX = 8
+_BATCH_WAIT = 0.05  # seconds
+
+def _run_classification(client: "InferenceClient", audio_bytes: bytes, fut: Future):
     try:
-        client = InferenceClient(api_key=st.session_state.hf_token)
-        
-        with open(audio_path, 'rb') as f:
-            result = client.audio_classification(
-                audio=f,
-                model="jihedjabnoun/wavlm-base-emotion"
-            )
-        
-        # Convert result to emotion scores
-        emotions = {}
-        for item in result:
-            label = item['label']
-            score = item['score']
-            # Map common emotion labels
-            if 'anger' in label.lower():
-                emotions['Anger'] = score
-            elif 'disgust' in label.lower():
-                emotions['Disgust'] = score
-            elif 'fear' in label.lower():
-                emotions['Fear'] = score
-            elif 'happy' in label.lower() or 'joy' in label.lower():
-                emotions['Happiness'] = score
-            elif 'neutral' in label.lower():
-                emotions['Neutral'] = score
-            elif 'sad' in label.lower():
-                emotions['Sadness'] = score
-            elif 'surprise' in label.lower():
-                emotions['Surprise'] = score
-        
-        # Ensure all emotions are present
-        for emotion in EMOTION_CONFIG.keys():
-            if emotion not in emotions:
-                emotions[emotion] = 0.0
-        
-        # Normalize scores
-        total = sum(emotions.values())
-        if total > 0:
-            emotions = {k: v/total for k, v in emotions.items()}
-        
-        return emotions
-    
+        fut.set_result(client.audio_classification(audio=audio_bytes, model=HF_MODEL))
     except Exception as e:
-        st.error(f"❌ Error analyzing emotion: {str(e)}")
-        return None
+        fut.set_exception(e)
+
+def _inference_worker(q: queue.Queue):
+    pool = ThreadPoolExecutor(max_workers=_BATCH_MAX)
+    while True:
+        batch = [q.get()]
+        deadline = time.monotonic() + _BATCH_WAIT
+        while len(batch) < _BATCH_MAX:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(q.get(timeout=remaining))
+            except queue.Empty:
+                break
+        for client, audio_bytes, fut in batch:
+            pool.submit(_run_classification, client, audio_bytes, fut)
+
+@st.cache_resource
+def _get_inference_queue() -> queue.Queue:
+    """Start the (process-wide) batching worker and return its submission queue"""
+    q = queue.Queue()
+    threading.Thread(target=_inference_worker, args=(q,), daemon=True).start()
+    return q
+
+@st.cache_resource
+def _get_client(token: str) -> "InferenceClient":
+    """Create (and cache) an InferenceClient so its connection pool is reused across reruns"""
+    from huggingface_hub import InferenceClient
+    return InferenceClient(api_key=token)
+
+@st.cache_resource
+def _get_executor() -> ThreadPoolExecutor:
+    """Pool for running the blocking classification off the script thread; the
+    script polls the future across reruns so the UI stays responsive"""
+    return ThreadPoolExecutor(max_workers=4)
+
+def classify_audio(client: "InferenceClient", audio_bytes: bytes) -> dict:
+    """Blocking classification + label mapping; safe to run off the script thread"""
+    fut = Future()
+    _get_inference_queue().put((client, audio_bytes, fut))
+    result = fut.result()
+
+    # Convert result to emotion scores in one pass; sub-labels mapping to
+    # the same emotion (e.g. 'happy' and 'joy') accumulate
+    emotions = dict.fromkeys(EMOTIONS, 0.0)
+    for item in result:
+        emotion = LABEL_TO_EMOTION.get(item['label'].lower().strip())
+        if emotion:
+            emotions[emotion] += item['score']
+
+    # Normalize scores
+    total = sum(emotions.values())
+    if total > 0:
+        emotions = {k: v/total for k, v in emotions.items()}
+
+    return emotions
+
+@st.cache_resource
+def _get_trim_kernel():
+    """Build the jitted trim kernel on first use so numba isn't imported at cold start"""
+    from numba import njit
+
+    @njit(cache=True, fastmath=True)
+    def trim_and_normalize(y, top_db):
+        """Trim leading/trailing silence and peak-normalize in a single fused pass"""
+        max_abs = 0.0
+        for i in range(y.shape[0]):
+            v = abs(y[i])
+            if v > max_abs:
+                max_abs = v
+        if max_abs == 0.0:
+            return y
+
+        threshold = max_abs * 10.0 ** (-top_db / 20.0)
+        start = 0
+        while start < y.shape[0] and abs(y[start]) < threshold:
+            start += 1
+        end = y.shape[0]
+        while end > start and abs(y[end - 1]) < threshold:
+            end -= 1
+
+        out = np.empty(end - start, dtype=y.dtype)
+        scale = 1.0 / max_abs
+        for i in range(out.shape[0]):
+            out[i] = y[start + i] * scale
+        return out
+
+    return trim_and_normalize
+
+@st.cache_data(show_spinner=False)
+def preprocess_audio_bytes(audio_bytes: bytes) -> bytes:
+    """Preprocess audio for better emotion detection (cached on content)"""
+    import scipy.signal
+    import soundfile as sf
 
-def preprocess_audio(audio_path: str) -> str:
-    """Preprocess audio for better emotion detection"""
     try:
         # Load audio
-        y, sr = librosa.load(audio_path, sr=16000)
-        
-        # Trim silence
-        y, _ = librosa.effects.trim(y, top_db=40)
-        
-        # Normalize
-        y = y / np.max(np.abs(y))
-        
-        # Save preprocessed audio
-        output_path = audio_path.replace('.wav', '_processed.wav')
-        sf.write(output_path, y, sr)
-        
-        return output_path
+        y, sr = sf.read(io.BytesIO(audio_bytes), dtype='float32')
+        if y.ndim > 1:
+            y = y.mean(axis=1)
+        if sr != 16000:
+            y = scipy.signal.resample_poly(y, 16000, sr)
+            sr = 16000
+
+        # Trim silence and normalize in one pass
+        y = _get_trim_kernel()(y, 40.0)
+
+        # Encode preprocessed audio as WAV
+        buf = io.BytesIO()
+        sf.write(buf, y, sr, format='WAV')
+
+        return buf.getvalue()
     except Exception as e:
         st.warning(f"⚠️ Could not preprocess audio: {str(e)}")
-        return audio_path
+        return audio_bytes
+
+def analyze_emotion(audio_bytes: bytes, processed_bytes: bytes) -> dict:
+    """Resolve emotion scores for a clip without blocking the script thread.
+
+    Submits the classification to the shared executor the first time a clip
+    is seen, then
+    polls the future across reruns so the spinner animates and other widgets
+    stay responsive; successful results are memoized per session (failures
+    are not, so the next rerun retries). Returns None while the call is in
+    flight or on error.
+    """
+    if not st.session_state.hf_token:
+        st.error("❌ Hugging Face API key not configured. Please set HUGGING_FACE_API_KEY environment variable.")
+        return None
+
+    key = (hash(audio_bytes), st.session_state.hf_token)
+    results = st.session_state.setdefault('analysis_results', {})
+    if key in results:
+        return results[key]
+
+    fut = st.session_state.get('pending_future')
+    if fut is None or st.session_state.get('pending_key') != key:
+        client = _get_client(st.session_state.hf_token)
+        fut = _get_executor().submit(classify_audio, client, processed_bytes)
+        st.session_state.pending_future = fut
+        st.session_state.pending_key = key
 
-def create_emotion_gauge(emotion: str, score: float) -> go.Figure:
-    """Create a gauge chart for emotion"""
+    if not fut.done():
+        with st.spinner("🧠 Analyzing emotion..."):
+            time.sleep(0.5)
+        st.rerun()
+
+    st.session_state.pending_future = None
+    err = fut.exception()
+    if err is not None:
+        # Don't memoize the failure: with no cached result and no pending
+        # future, the next rerun resubmits, matching the old retry behavior
+        st.error(f"❌ Error analyzing emotion: {str(err)}")
+        return None
+    results[key] = fut.result()
+    return results[key]
+
+def _build_gauge_trace(emotion: str) -> dict:
+    """Build the invariant indicator trace for one emotion's gauge; only 'value' changes per render"""
     config = EMOTION_CONFIG[emotion]
-    
-    fig = go.Figure(go.Indicator(
-        mode="gauge+number+delta",
-        value=score * 100,
-        title={'text': f"{emotion} {config['emoji']}"},
-        domain={'x': [0, 1], 'y': [0, 1]},
-        gauge={
+    return {
+        'type': 'indicator',
+        'mode': 'gauge+number+delta',
+        'value': 0,
+        'title': {'text': f"{emotion} {config['emoji']}"},
+        'gauge': {
             'axis': {'range': [0, 100]},
             'bar': {'color': config['color']},
             'steps': [
@@ -231,69 +347,133 @@ def create_emotion_gauge(emotion: str, score: float) -> go.Figure:
                 'value': 90
             }
         }
-    ))
-    
+    }
+
+_GAUGE_TRACES = {emotion: _build_gauge_trace(emotion) for emotion in EMOTION_CONFIG}
+
+_RADAR_TRACE = {
+    'type': 'scatterpolar',
+    'fill': 'toself',
+    'name': 'Emotions',
+    'line': {'color': '#6366f1'},
+    'fillcolor': 'rgba(99, 102, 241, 0.3)',
+    'marker': {'size': 8, 'color': '#a855f7'}
+}
+
+_RADAR_LAYOUT = {
+    'polar': {
+        'radialaxis': {
+            'visible': True,
+            'range': [0, 1],
+            'tickcolor': '#475569',
+            'gridcolor': '#334155'
+        },
+        'angularaxis': {'tickcolor': '#475569'},
+        'bgcolor': 'rgba(30, 41, 59, 0.3)'
+    },
+    'height': 500,
+    'margin': {'l': 80, 'r': 80, 't': 80, 'b': 80},
+    'paper_bgcolor': 'rgba(15, 23, 42, 0)',
+    'font': {'color': '#f1f5f9', 'size': 12},
+    'showlegend': False
+}
+
+def create_emotion_gauges(emotions: dict) -> "go.Figure":
+    """Create one figure holding all emotion gauges, so the browser mounts a single chart"""
+    from plotly.subplots import make_subplots
+
+    fig = make_subplots(rows=2, cols=4, specs=[[{'type': 'indicator'}] * 4] * 2)
+    for i, (emotion, score) in enumerate(emotions.items()):
+        fig.add_trace(
+            dict(_GAUGE_TRACES[emotion], value=score * 100),
+            row=i // 4 + 1, col=i % 4 + 1
+        )
     fig.update_layout(
-        height=300,
+        height=600,
         margin=dict(l=10, r=10, t=50, b=10),
         paper_bgcolor='rgba(15, 23, 42, 0)',
-        plot_bgcolor='rgba(30, 41, 59, 0.5)',
         font=dict(color='#f1f5f9', size=12)
     )
-    
     return fig
 
-def create_emotion_radar(emotions: dict) -> go.Figure:
+def create_emotion_radar(emotions: dict) -> "go.Figure":
     """Create a radar chart for all emotions"""
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatterpolar(
-        r=list(emotions.values()),
-        theta=list(emotions.keys()),
-        fill='toself',
-        name='Emotions',
-        line_color='#6366f1',
-        fillcolor='rgba(99, 102, 241, 0.3)',
-        marker=dict(size=8, color='#a855f7')
-    ))
-    
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, max(emotions.values()) * 1.2],
-                tickcolor='#475569',
-                gridcolor='#334155'
-            ),
-            angularaxis=dict(tickcolor='#475569'),
-            bgcolor='rgba(30, 41, 59, 0.3)'
-        ),
-        height=500,
-        margin=dict(l=80, r=80, t=80, b=80),
-        paper_bgcolor='rgba(15, 23, 42, 0)',
-        font=dict(color='#f1f5f9', size=12),
-        showlegend=False
-    )
-    
-    return fig
+    import plotly.graph_objects as go
 
-def create_frequency_visualization(audio_path: str) -> go.Figure:
-    """Create frequency spectrum visualization"""
+    polar = dict(_RADAR_LAYOUT['polar'])
+    polar['radialaxis'] = dict(polar['radialaxis'], range=[0, max(emotions.values()) * 1.2])
+    return go.Figure({
+        'data': [dict(_RADAR_TRACE, r=list(emotions.values()), theta=list(emotions.keys()))],
+        'layout': dict(_RADAR_LAYOUT, polar=polar)
+    })
+
+def _block_mean(S: np.ndarray, target: int = 256) -> np.ndarray:
+    """Bin-average a 2D array down to at most target x target cells"""
+    br = max(1, S.shape[0] // target)
+    bc = max(1, S.shape[1] // target)
+    if br == 1 and bc == 1:
+        return S
+    rows = (S.shape[0] // br) * br
+    cols = (S.shape[1] // bc) * bc
+    return S[:rows, :cols].reshape(rows // br, br, cols // bc, bc).mean(axis=(1, 3))
+
+@st.cache_resource
+def _maybe_torch():
+    """Import torch if installed; its MKL/cuFFT-backed STFT beats the scipy path"""
     try:
-        y, sr = librosa.load(audio_path, sr=16000)
-        
-        # Compute STFT
-        D = librosa.stft(y)
-        S = np.abs(D)
-        
-        # Convert to dB
-        S_db = librosa.power_to_db(S**2, ref=np.max)
-        
+        import torch
+        return torch
+    except ImportError:
+        return None
+
+def _spectrogram_db(y: np.ndarray, sr: int) -> np.ndarray:
+    """Compute the downsampled dB spectrogram, on GPU via torch.stft when available"""
+    torch = _maybe_torch()
+    if torch is not None:
+        device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        y_t = torch.from_numpy(y).to(device)
+        window = torch.hann_window(2048, device=device)
+        Z = torch.stft(y_t, n_fft=2048, hop_length=512, window=window, return_complex=True)
+        S = Z.abs()
+        S_db = 20 * torch.log10(torch.clamp(S, min=1e-10) / S.max())
+
+        # Downsample on device so only the small matrix crosses to host memory
+        br = max(1, S_db.shape[0] // 256)
+        bc = max(1, S_db.shape[1] // 256)
+        if br > 1 or bc > 1:
+            S_db = torch.nn.functional.avg_pool2d(
+                S_db.unsqueeze(0).unsqueeze(0), kernel_size=(br, bc)
+            ).squeeze(0).squeeze(0)
+        return S_db.cpu().numpy().astype(np.float32)
+
+    # CPU fallback: scipy's pocketfft backend
+    import scipy.signal
+    _, _, Z = scipy.signal.stft(y, fs=sr, nperseg=2048)
+    S = np.abs(Z)
+    S_db = 20 * np.log10(np.maximum(S, 1e-10) / S.max())
+
+    # Downsample before serialization; the full matrix would dominate the JSON payload
+    return _block_mean(S_db).astype(np.float32)
+
+@st.cache_data(show_spinner=False)
+def create_frequency_visualization(audio_bytes: bytes) -> "go.Figure":
+    """Create frequency spectrum visualization (cached on content)"""
+    import plotly.graph_objects as go
+    import soundfile as sf
+
+    try:
+        y, sr = sf.read(io.BytesIO(audio_bytes), dtype='float32')
+        if y.ndim > 1:
+            y = y.mean(axis=1)
+
+        S_db = _spectrogram_db(y, sr)
+
         # Create spectrogram
         fig = go.Figure(data=go.Heatmap(
             z=S_db,
             colorscale='Viridis',
-            colorbar=dict(title="Magnitude (dB)")
+            colorbar=dict(title="Magnitude (dB)"),
+            zsmooth='best'
         ))
         
         fig.update_layout(
@@ -311,15 +491,67 @@ def create_frequency_visualization(audio_path: str) -> go.Figure:
         st.warning(f"⚠️ Could not create frequency visualization: {str(e)}")
         return None
 
-def save_recording(emotions: dict, audio_path: str, intensity: float = 1.0):
+@st.cache_data(show_spinner=False)
+def build_analytics_df(rows: tuple) -> "pd.DataFrame":
+    """Build the recordings frame, cached so tab switches and button clicks don't rebuild it"""
+    import pandas as pd
+    return pd.DataFrame(rows, columns=['Timestamp', 'Emotion', 'Confidence', 'Language'])
+
+def _analytics_rows() -> tuple:
+    """Hashable snapshot of the recordings used to key the analytics cache"""
+    return tuple(
+        (r['timestamp'], r['dominant_emotion'], r['confidence'], r['language'])
+        for r in st.session_state.recordings
+    )
+
+@st.cache_resource
+def _feedback_fh():
+    """Buffered append handle for feedback.jsonl, kept open for the process"""
+    return open('feedback.jsonl', 'ab', buffering=64 * 1024)
+
+def _load_feedback_rows(feedback_file: Path) -> list:
+    """Incrementally parse feedback.jsonl, reading only bytes appended since the last rerun"""
+    if 'feedback_rows' not in st.session_state:
+        st.session_state.feedback_rows = []
+        st.session_state.feedback_offset = 0
+    if feedback_file.exists():
+        with open(feedback_file, 'rb') as f:
+            f.seek(st.session_state.feedback_offset)
+            new = f.read()
+            st.session_state.feedback_offset = f.tell()
+        if new:
+            st.session_state.feedback_rows.extend(
+                orjson.loads(line) for line in new.splitlines() if line.strip()
+            )
+    return st.session_state.feedback_rows
+
+@st.cache_resource
+def _supported_upload_types() -> list:
+    """Upload extensions the installed libsndfile build can actually decode.
+
+    m4a went away with librosa, and mp3 needs libsndfile >= 1.1.0, so probe
+    soundfile instead of advertising formats that would fail preprocessing.
+    """
+    import soundfile as sf
+    types = ['wav', 'flac', 'ogg']
+    if 'MP3' in sf.available_formats():
+        types.append('mp3')
+    return types
+
+def save_recording(emotions: dict, intensity: float = 1.0):
     """Save recording to session state"""
+    # Fixed-order score array so reading paths use one argmax instead of
+    # Python-level passes over the dict
+    scores = np.fromiter((emotions[e] for e in EMOTIONS), dtype=np.float32, count=len(EMOTIONS))
+    dom_idx = int(scores.argmax())
     recording = {
         'timestamp': datetime.now().isoformat(),
         'emotions': emotions,
-        'dominant_emotion': max(emotions, key=emotions.get),
-        'confidence': max(emotions.values()),
+        'scores': scores,
+        'dom_idx': dom_idx,
+        'dominant_emotion': EMOTIONS[dom_idx],
+        'confidence': float(scores[dom_idx]),
         'intensity': intensity,
-        'audio_path': audio_path,
         'language': st.session_state.selected_language
     }
     st.session_state.recordings.append(recording)
@@ -380,17 +612,12 @@ def main():
         
         # Statistics
         if st.session_state.recordings:
+            import plotly.express as px
+
             st.markdown("### 📈 Statistics")
-            
-            df = pd.DataFrame([
-                {
-                    'Emotion': r['dominant_emotion'],
-                    'Confidence': r['confidence'],
-                    'Time': r['timestamp']
-                }
-                for r in st.session_state.recordings
-            ])
-            
+
+            df = build_analytics_df(_analytics_rows())
+
             emotion_counts = df['Emotion'].value_counts()
             
             fig = px.pie(
@@ -446,10 +673,11 @@ def main():
         col1, col2 = st.columns(2)
         
         with col1:
+            upload_types = _supported_upload_types()
             audio_file = st.file_uploader(
                 "Upload audio file",
-                type=['wav', 'mp3', 'ogg', 'm4a'],
-                help="Supported formats: WAV, MP3, OGG, M4A"
+                type=upload_types,
+                help="Supported formats: " + ", ".join(t.upper() for t in upload_types)
             )
         
         with col2:
@@ -460,43 +688,36 @@ def main():
         if audio_file or audio_data:
             st.markdown("---")
             
-            # Save audio temporarily
-            if audio_file:
-                audio_bytes = audio_file.read()
-                audio_path = f"/tmp/{audio_file.name}"
-            else:
-                audio_bytes = audio_data.getvalue()
-                audio_path = "/tmp/recorded_audio.wav"
-            
-            with open(audio_path, 'wb') as f:
-                f.write(audio_bytes)
-            
+            # Get the clip as bytes; the whole pipeline downstream is
+            # content-addressed and in-memory, so nothing touches disk
+            audio_bytes = audio_file.getvalue() if audio_file else audio_data.getvalue()
+
             # Preprocess
             with st.spinner("🔄 Preprocessing audio..."):
-                processed_path = preprocess_audio(audio_path)
-            
-            # Analyze emotion
-            with st.spinner("🧠 Analyzing emotion..."):
-                emotions = get_emotion_from_huggingface(processed_path)
+                processed_bytes = preprocess_audio_bytes(audio_bytes)
+
+            # Analyze emotion (non-blocking; reruns poll until the future resolves)
+            emotions = analyze_emotion(audio_bytes, processed_bytes)
             
             if emotions:
                 # Save recording
-                save_recording(emotions, audio_path, intensity)
+                save_recording(emotions, intensity)
                 
                 # Display results
                 st.success("✅ Analysis Complete!")
                 
                 st.markdown("### 🎯 Emotion Detection Results")
                 
-                # Dominant emotion
-                dominant_emotion = max(emotions, key=emotions.get)
+                # Dominant emotion (precomputed by save_recording)
+                recording = st.session_state.recordings[-1]
+                dominant_emotion = recording['dominant_emotion']
                 config = EMOTION_CONFIG[dominant_emotion]
-                
+
                 st.markdown(f"""
                 <div class="emotion-card">
                     <h2>{config['emoji']} {dominant_emotion}</h2>
                     <p style="font-size: 24px; color: {config['color']};">
-                        {emotions[dominant_emotion]*100:.1f}% Confidence
+                        {recording['scores'][recording['dom_idx']]*100:.1f}% Confidence
                     </p>
                 </div>
                 """, unsafe_allow_html=True)
@@ -504,22 +725,21 @@ def main():
                 # Emotion gauges
                 st.markdown("### 📊 Detailed Breakdown")
                 
-                cols = st.columns(4)
-                for idx, (emotion, score) in enumerate(emotions.items()):
-                    with cols[idx % 4]:
-                        fig = create_emotion_gauge(emotion, score)
-                        st.plotly_chart(fig, use_container_width=True)
+                fig = create_emotion_gauges(emotions)
+                st.plotly_chart(fig, use_container_width=True)
                 
                 # Radar chart
                 st.markdown("### 🎯 Emotion Radar")
                 fig = create_emotion_radar(emotions)
                 st.plotly_chart(fig, use_container_width=True)
                 
-                # Frequency visualization
-                st.markdown("### 📈 Frequency Spectrum")
-                fig = create_frequency_visualization(processed_path)
-                if fig:
-                    st.plotly_chart(fig, use_container_width=True)
+                # Frequency visualization, computed only on demand (expander
+                # bodies still execute while collapsed, so gate on a toggle)
+                with st.expander("📈 Frequency Spectrum", expanded=False):
+                    if st.toggle("Show spectrum"):
+                        fig = create_frequency_visualization(processed_bytes)
+                        if fig:
+                            st.plotly_chart(fig, use_container_width=True)
                 
                 # Intensity adjustment
                 st.markdown("### 🎚️ Adjust Confidence")
@@ -537,7 +757,8 @@ def main():
                 
                 with col3:
                     if st.button("🔄 Reset"):
-                        st.session_state.recordings[-1]['confidence'] = max(emotions.values())
+                        last = st.session_state.recordings[-1]
+                        last['confidence'] = float(last['scores'][last['dom_idx']])
                         st.rerun()
     
     with tab2:
@@ -554,29 +775,26 @@ def main():
             )
             
             if indices:
-                # Create comparison data
-                comparison_data = []
-                for idx in indices:
-                    recording = st.session_state.recordings[idx]
-                    comparison_data.append({
-                        'Recording': f"#{idx+1} - {recording['dominant_emotion']}",
-                        **recording['emotions']
-                    })
-                
-                df = pd.DataFrame(comparison_data)
-                
+                import pandas as pd
+                import plotly.graph_objects as go
+
+                # Stack the per-recording score arrays; no DataFrame row dispatch needed
+                emotion_keys = list(EMOTIONS)
+                mat = np.stack([st.session_state.recordings[i]['scores'] for i in indices])
+                names = [
+                    f"#{i+1} - {st.session_state.recordings[i]['dominant_emotion']}"
+                    for i in indices
+                ]
+
                 # Radar comparison
                 fig = go.Figure()
-                
-                for idx, row in df.iterrows():
-                    emotions_list = list(EMOTION_CONFIG.keys())
-                    values = [row[e] for e in emotions_list]
-                    
+
+                for row_idx in range(mat.shape[0]):
                     fig.add_trace(go.Scatterpolar(
-                        r=values,
-                        theta=emotions_list,
+                        r=mat[row_idx],
+                        theta=emotion_keys,
                         fill='toself',
-                        name=row['Recording'],
+                        name=names[row_idx],
                         opacity=0.7
                     ))
                 
@@ -595,7 +813,10 @@ def main():
                 
                 # Comparison table
                 st.markdown("### 📋 Detailed Comparison")
-                st.dataframe(df, use_container_width=True)
+                st.dataframe(
+                    pd.DataFrame(mat, columns=emotion_keys, index=names),
+                    use_container_width=True
+                )
     
     with tab3:
         st.markdown("### 📈 Analytics Dashboard")
@@ -603,16 +824,10 @@ def main():
         if not st.session_state.recordings:
             st.info("📝 No recordings yet. Start recording to see analytics!")
         else:
+            import plotly.express as px
+
             # Create analytics dataframe
-            df = pd.DataFrame([
-                {
-                    'Timestamp': r['timestamp'],
-                    'Emotion': r['dominant_emotion'],
-                    'Confidence': r['confidence'],
-                    'Language': r['language']
-                }
-                for r in st.session_state.recordings
-            ])
+            df = build_analytics_df(_analytics_rows())
             
             col1, col2, col3 = st.columns(3)
             
@@ -741,9 +956,9 @@ def main():
                 }
                 
                 # Save feedback to file
-                feedback_file = Path("feedback.jsonl")
-                with open(feedback_file, 'a') as f:
-                    f.write(json.dumps(feedback) + '\n')
+                fh = _feedback_fh()
+                fh.write(orjson.dumps(feedback) + b'\n')
+                fh.flush()
                 
                 st.success("✅ Feedback submitted! Thank you for helping us improve.")
             
@@ -751,15 +966,12 @@ def main():
             st.markdown("---")
             st.markdown("### 📊 Feedback Statistics")
             
-            feedback_file = Path("feedback.jsonl")
-            if feedback_file.exists():
-                feedback_data = []
-                with open(feedback_file, 'r') as f:
-                    for line in f:
-                        feedback_data.append(json.loads(line))
-                
-                df_feedback = pd.DataFrame(feedback_data)
-                
+            feedback_rows = _load_feedback_rows(Path("feedback.jsonl"))
+            if feedback_rows:
+                import pandas as pd
+
+                df_feedback = pd.DataFrame.from_records(feedback_rows)
+
                 col1, col2, col3 = st.columns(3)
                 
                 with col1: